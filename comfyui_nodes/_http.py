@@ -0,0 +1,51 @@
+"""
+Shared HTTP session for CinemaOS nodes
+
+A single pooled requests.Session reused by every node so repeated calls
+to the Vault or Fal.ai keep their connections alive instead of paying a
+new TCP + TLS handshake per request. JSON bodies go through orjson when
+it is installed.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _build_session():
+    """Create a keep-alive session with a connection pool per scheme"""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = _build_session()
+
+
+def post_json(url, payload, headers=None, **kwargs):
+    """POST a JSON body on the shared session"""
+    if orjson is None:
+        return session.post(url, json=payload, headers=headers, **kwargs)
+    
+    headers = {**(headers or {}), "Content-Type": "application/json"}
+    return session.post(url, data=orjson.dumps(payload), headers=headers, **kwargs)
+
+
+def parse_json(response):
+    """Decode a JSON response body"""
+    if orjson is None:
+        return response.json()
+    
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Keep callers' `except requests.RequestException` handling intact
+        raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
@@ -0,0 +1,59 @@
+"""
+Image helpers for CinemaOS nodes
+
+Conversions between ComfyUI IMAGE tensors and PNG payloads, shared by the
+Fal.ai provider and the Vault save node.
+"""
+
+import base64
+import threading
+from io import BytesIO
+
+
+# Per-thread PNG scratch buffer, reused across encodes so large images
+# don't regrow a fresh BytesIO every call
+_local = threading.local()
+
+
+def tensor_to_pil(image):
+    """Convert the first image of a ComfyUI IMAGE batch to a PIL image"""
+    from PIL import Image
+    import torch
+    
+    # Scale and cast on the tensor's device so only uint8 data is copied back
+    img_np = image[0].mul(255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+    return Image.fromarray(img_np)
+
+
+def pil_to_tensor(pil_image):
+    """Convert a uint8 PIL image to a single-image ComfyUI IMAGE batch"""
+    import numpy as np
+    import torch
+    
+    img_np = np.multiply(np.asarray(pil_image), np.float32(1 / 255.0), dtype=np.float32)
+    return torch.from_numpy(img_np).unsqueeze_(0)
+
+
+def _encode_png(pil_image):
+    """Encode a PIL image as PNG into this thread's scratch buffer"""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = BytesIO()
+    
+    # Rewind and overwrite rather than truncate(0), which frees the allocation
+    buffer.seek(0)
+    pil_image.save(buffer, format="PNG", compress_level=1)
+    buffer.truncate()
+    return buffer
+
+
+def encode_png(pil_image):
+    """Encode a PIL image as PNG bytes, favouring speed over file size"""
+    return _encode_png(pil_image).getvalue()
+
+
+def encode_png_base64(pil_image):
+    """Encode a PIL image as base64 PNG, favouring speed over file size"""
+    buffer = _encode_png(pil_image)
+    with buffer.getbuffer() as view:
+        return base64.b64encode(view).decode("ascii")
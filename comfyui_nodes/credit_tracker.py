@@ -6,8 +6,73 @@ Tracks credit usage for cloud generation and reports to CinemaOS.
 
 import os
 import json
+import queue
+import threading
+import time
 import requests
-from datetime import datetime
+
+from ._http import post_json
+
+
+# Credit events waiting to be reported, as (vault_url, payload) pairs.
+# Reporting is best-effort, so a single daemon thread forwards them in
+# batches instead of blocking the workflow on a Vault round-trip.
+_MAX_PENDING_EVENTS = 1024
+_MAX_BATCH_SIZE = 32
+_pending_events = queue.Queue(maxsize=_MAX_PENDING_EVENTS)
+
+
+def _next_batch():
+    """Block for one event, then gather whatever else arrives shortly after"""
+    batch = [_pending_events.get()]
+    while len(batch) < _MAX_BATCH_SIZE:
+        try:
+            batch.append(_pending_events.get(timeout=0.1))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _report_events():
+    """Forward queued credit events to the Vault, retrying with backoff"""
+    backoff = 0.5
+    while True:
+        batches = {}
+        for vault_url, payload in _next_batch():
+            batches.setdefault(vault_url, []).append(payload)
+        
+        retry = []
+        for vault_url, events in batches.items():
+            try:
+                response = post_json(
+                    f"{vault_url}/api/credits/usage/batch",
+                    {"events": events},
+                    timeout=5
+                )
+                # Only server errors are worth retrying; a rejected batch won't improve
+                if response.status_code >= 500:
+                    retry.extend((vault_url, event) for event in events)
+            except requests.RequestException:
+                retry.extend((vault_url, event) for event in events)
+            except Exception as e:
+                # A bad URL or unserializable payload fails the same way every time,
+                # so drop the batch instead of letting it kill the reporter thread
+                print(f"[CinemaOS] Dropping {len(events)} credit event(s) for {vault_url}: {e!r}")
+        
+        if not retry:
+            backoff = 0.5
+            continue
+        
+        for item in retry:
+            try:
+                _pending_events.put_nowait(item)
+            except queue.Full:
+                break
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
+
+
+threading.Thread(target=_report_events, name="CinemaOS-credits", daemon=True).start()
 
 
 class CreditTrackerNode:
@@ -38,6 +103,7 @@ class CreditTrackerNode:
     
     # Class-level credit accumulator
     _session_credits = 0.0
+    _credits_lock = threading.Lock()
     
     def track_credits(self, credits_used, model_name, 
                       vault_url="http://localhost:8080",
@@ -53,44 +119,39 @@ class CreditTrackerNode:
         except (ValueError, TypeError):
             credits = 0.0
         
-        # Accumulate
-        CreditTrackerNode._session_credits += credits
+        # Accumulate; += on a class attribute is not atomic across threads
+        with CreditTrackerNode._credits_lock:
+            CreditTrackerNode._session_credits += credits
+            total_credits = CreditTrackerNode._session_credits
+        
+        # Queue the report for the Vault
+        payload = {
+            "credits": credits,
+            "model": model_name,
+            "project_id": project_id,
+            "timestamp_ns": time.time_ns(),
+            "node_id": unique_id,
+        }
         
-        # Report to Vault
         try:
-            payload = {
-                "credits": credits,
-                "model": model_name,
-                "project_id": project_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "node_id": unique_id,
-            }
-            
-            response = requests.post(
-                f"{vault_url}/api/credits/usage",
-                json=payload,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                status = "reported"
-            else:
-                status = "local_only"
-                
-        except requests.RequestException:
-            status = "offline"
+            _pending_events.put_nowait((vault_url, payload))
+            status = "queued"
+        except queue.Full:
+            status = "local_only"
         
         return (
-            f"{CreditTrackerNode._session_credits:.4f}",
+            f"{total_credits:.4f}",
             status
         )
     
     @classmethod
     def reset_session_credits(cls):
         """Reset session credit counter"""
-        cls._session_credits = 0.0
+        with cls._credits_lock:
+            cls._session_credits = 0.0
     
     @classmethod
     def get_session_credits(cls):
         """Get current session credits"""
-        return cls._session_credits
+        with cls._credits_lock:
+            return cls._session_credits
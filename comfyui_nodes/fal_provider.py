@@ -6,12 +6,11 @@ Supports: FLUX, Kling, Veo, and other Fal.ai models.
 """
 
 import os
-import requests
-import base64
 from io import BytesIO
-from PIL import Image
-import numpy as np
-import torch
+from types import MappingProxyType
+
+from ._http import session, post_json, parse_json
+from ._image import tensor_to_pil, pil_to_tensor, encode_png_base64
 
 
 class FalProviderNode:
@@ -41,9 +40,34 @@ class FalProviderNode:
     RETURN_NAMES = ("image", "credits_used")
     FUNCTION = "generate"
     
+    # Map model names to Fal.ai endpoints
+    _MODEL_ENDPOINTS = MappingProxyType({
+        "flux-2-pro": "fal-ai/flux-2/pro",
+        "flux-1.1-pro": "fal-ai/flux-pro/v1.1",
+        "flux-schnell": "fal-ai/flux/schnell",
+        "kling-v2.5-turbo": "fal-ai/kling-video/v2.5/turbo/image-to-video",
+        "seedream-4.5": "fal-ai/seedream/v4.5",
+    })
+    _DEFAULT_ENDPOINT = "fal-ai/flux/schnell"
+    
+    # Approximate cost per 1024x1024 image
+    _BASE_COSTS = MappingProxyType({
+        "flux-2-pro": 0.05,
+        "flux-1.1-pro": 0.04,
+        "flux-schnell": 0.003,
+        "kling-v2.5-turbo": 0.08,  # per second
+        "seedream-4.5": 0.02,
+    })
+    
     def __init__(self):
         self.api_key = os.environ.get("FAL_API_KEY", "")
         self.base_url = "https://fal.run"
+        # Built once per node; the shared session also talks to the Vault,
+        # so the Fal key must not live in its default headers.
+        self.headers = {
+            "Authorization": f"Key {self.api_key}",
+            "Content-Type": "application/json",
+        }
     
     def generate(self, prompt, model, width, height, 
                  negative_prompt="", seed=-1, num_steps=28, 
@@ -52,16 +76,10 @@ class FalProviderNode:
         if not self.api_key:
             raise ValueError("FAL_API_KEY environment variable not set")
         
-        # Map model names to Fal.ai endpoints
-        model_endpoints = {
-            "flux-2-pro": "fal-ai/flux-2/pro",
-            "flux-1.1-pro": "fal-ai/flux-pro/v1.1",
-            "flux-schnell": "fal-ai/flux/schnell",
-            "kling-v2.5-turbo": "fal-ai/kling-video/v2.5/turbo/image-to-video",
-            "seedream-4.5": "fal-ai/seedream/v4.5",
-        }
+        # Heavy imports are deferred so registering the node stays cheap
+        from PIL import Image
         
-        endpoint = model_endpoints.get(model, "fal-ai/flux/schnell")
+        endpoint = self._MODEL_ENDPOINTS.get(model, self._DEFAULT_ENDPOINT)
         url = f"{self.base_url}/{endpoint}"
         
         # Build request payload
@@ -80,32 +98,26 @@ class FalProviderNode:
         # Handle input image for i2i
         if input_image is not None:
             # Convert tensor to base64
-            img_np = (input_image[0].cpu().numpy() * 255).astype(np.uint8)
-            img = Image.fromarray(img_np)
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            img_b64 = base64.b64encode(buffer.getvalue()).decode()
+            img_b64 = encode_png_base64(tensor_to_pil(input_image))
             payload["image_url"] = f"data:image/png;base64,{img_b64}"
         
         # Make API request
-        headers = {
-            "Authorization": f"Key {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        response = requests.post(url, json=payload, headers=headers)
+        # Fail fast on connect, but leave the read open: fal.run holds the
+        # request until generation finishes, which can take minutes for video.
+        response = post_json(url, payload, headers=self.headers,
+                             timeout=(5, None))
         response.raise_for_status()
         
-        result = response.json()
+        result = parse_json(response)
         
         # Get image from response
         if "images" in result and len(result["images"]) > 0:
             img_url = result["images"][0].get("url", "")
             if img_url:
-                img_response = requests.get(img_url)
+                img_response = session.get(img_url, timeout=(5, 30))
+                img_response.raise_for_status()
                 img = Image.open(BytesIO(img_response.content))
-                img_np = np.array(img).astype(np.float32) / 255.0
-                img_tensor = torch.from_numpy(img_np).unsqueeze(0)
+                img_tensor = pil_to_tensor(img)
                 
                 # Calculate credits (approximate)
                 credits = self._estimate_credits(model, width, height)
@@ -116,14 +128,7 @@ class FalProviderNode:
     
     def _estimate_credits(self, model, width, height):
         """Estimate credits used based on model and resolution"""
-        base_costs = {
-            "flux-2-pro": 0.05,
-            "flux-1.1-pro": 0.04,
-            "flux-schnell": 0.003,
-            "kling-v2.5-turbo": 0.08,  # per second
-            "seedream-4.5": 0.02,
-        }
-        base = base_costs.get(model, 0.01)
+        base = self._BASE_COSTS.get(model, 0.01)
         # Scale by resolution
         pixels = width * height
         scale = pixels / (1024 * 1024)
@@ -6,9 +6,68 @@ Provides consistent prompting based on stored token data.
 """
 
 import json
+import threading
+import time
 import requests
+from collections import OrderedDict
 from typing import Optional
 
+from ._http import session, parse_json
+
+
+# Token responses keyed by (vault_url, token_type, token_name), holding
+# (etag, token_data, prompt_context) so unchanged tokens are revalidated
+# with If-None-Match instead of re-downloaded and re-parsed.
+_TOKEN_CACHE_SIZE = 256
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# Tokens the Vault answered 404 for, keyed like _token_cache and mapped to
+# the monotonic time the entry expires, so a typo'd name doesn't hit the
+# Vault on every execution but a newly created token still shows up
+_MISSING_TOKEN_TTL = 30.0
+_missing_tokens = OrderedDict()
+
+
+# Per token type, the (field, template) pairs appended after the token
+# name when the token has a value for that field
+_PROMPT_FIELDS = {
+    "character": (
+        ("age", "{} years old"),
+        ("appearance", "{}"),
+        ("clothing", "wearing {}"),
+        ("description", "{}"),
+    ),
+    "location": (
+        ("setting", "{}"),
+        ("time_of_day", "during {}"),
+        ("weather", "{} weather"),
+        ("description", "{}"),
+    ),
+    "prop": (
+        ("color", "{}"),
+        ("material", "made of {}"),
+        ("description", "{}"),
+    ),
+}
+_DEFAULT_PROMPT_FIELDS = (("description", "{}"),)
+
+
+def _cache_get(cache, key):
+    with _token_cache_lock:
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(cache, key, entry):
+    with _token_cache_lock:
+        cache[key] = entry
+        cache.move_to_end(key)
+        while len(cache) > _TOKEN_CACHE_SIZE:
+            cache.popitem(last=False)
+
 
 class VaultContextNode:
     """Load context from CinemaOS Vault"""
@@ -32,7 +91,8 @@ class VaultContextNode:
     RETURN_NAMES = ("prompt_context", "style_prompt", "reference_image_path")
     FUNCTION = "load_context"
     
-    def load_context(self, token_type, token_name, vault_url="http://localhost:8080", include_visuals=True):
+    @staticmethod
+    def load_context(token_type, token_name, vault_url="http://localhost:8080", include_visuals=True):
         """
         Load token context from the Vault.
         Returns prompt context, style guidance, and reference image path.
@@ -41,21 +101,38 @@ class VaultContextNode:
         if not token_name:
             return ("", "", "")
         
+        cache_key = (vault_url, token_type, token_name)
+        missing_until = _cache_get(_missing_tokens, cache_key)
+        if missing_until is not None and time.monotonic() < missing_until:
+            return ("", "", "")
+        cached = _cache_get(_token_cache, cache_key)
+        
         try:
-            # Query the Vault for this token
-            response = requests.get(
+            # Query the Vault for this token, revalidating any cached copy
+            headers = {"If-None-Match": cached[0]} if cached else None
+            response = session.get(
                 f"{vault_url}/api/tokens/{token_type}/{token_name}",
+                headers=headers,
                 timeout=5
             )
             
-            if response.status_code != 200:
+            if response.status_code == 304 and cached:
+                _, token_data, prompt_context = cached
+            elif response.status_code != 200:
                 # Token not found, return empty
+                if response.status_code == 404:
+                    _cache_put(_missing_tokens, cache_key,
+                               time.monotonic() + _MISSING_TOKEN_TTL)
                 return ("", "", "")
-            
-            token_data = response.json()
-            
-            # Build prompt context from token data
-            prompt_context = self._build_prompt_context(token_type, token_data)
+            else:
+                token_data = parse_json(response)
+                
+                # Build prompt context from token data
+                prompt_context = VaultContextNode._build_prompt_context(token_type, token_data)
+                
+                etag = response.headers.get("ETag")
+                if etag:
+                    _cache_put(_token_cache, cache_key, (etag, token_data, prompt_context))
             
             # Get style prompt if available
             style_prompt = token_data.get("style_prompt", "")
@@ -73,61 +150,15 @@ class VaultContextNode:
             # Vault not available, return empty
             return ("", "", "")
     
-    def _build_prompt_context(self, token_type, token_data):
+    @staticmethod
+    def _build_prompt_context(token_type, token_data):
         """Build a prompt context string from token data"""
         
-        name = token_data.get("name", "")
-        description = token_data.get("description", "")
-        
-        if token_type == "character":
-            # Build character description
-            age = token_data.get("age", "")
-            appearance = token_data.get("appearance", "")
-            clothing = token_data.get("clothing", "")
-            
-            parts = [f"{name}"]
-            if age:
-                parts.append(f"{age} years old")
-            if appearance:
-                parts.append(appearance)
-            if clothing:
-                parts.append(f"wearing {clothing}")
-            if description:
-                parts.append(description)
-            
-            return ", ".join(parts)
-        
-        elif token_type == "location":
-            # Build location description
-            setting = token_data.get("setting", "")
-            time_of_day = token_data.get("time_of_day", "")
-            weather = token_data.get("weather", "")
-            
-            parts = [name]
-            if setting:
-                parts.append(setting)
-            if time_of_day:
-                parts.append(f"during {time_of_day}")
-            if weather:
-                parts.append(f"{weather} weather")
-            if description:
-                parts.append(description)
-            
-            return ", ".join(parts)
-        
-        elif token_type == "prop":
-            # Build prop description
-            material = token_data.get("material", "")
-            color = token_data.get("color", "")
-            
-            parts = [name]
-            if color:
-                parts.append(color)
-            if material:
-                parts.append(f"made of {material}")
-            if description:
-                parts.append(description)
-            
-            return ", ".join(parts)
-        
-        return f"{name}, {description}" if description else name
+        fields = _PROMPT_FIELDS.get(token_type, _DEFAULT_PROMPT_FIELDS)
+        parts = [str(token_data.get("name", ""))]
+        parts.extend(
+            template.format(token_data[key])
+            for key, template in fields
+            if token_data.get(key)
+        )
+        return ", ".join(parts)
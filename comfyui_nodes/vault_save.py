@@ -8,10 +8,9 @@ Links outputs to tokens for consistency tracking.
 import os
 import uuid
 import requests
-import base64
-from io import BytesIO
-from PIL import Image
-import numpy as np
+
+from ._http import session, post_json, parse_json
+from ._image import tensor_to_pil, encode_png, encode_png_base64
 
 
 class VaultSaveNode:
@@ -31,6 +30,8 @@ class VaultSaveNode:
                 "vault_url": ("STRING", {"default": "http://localhost:8080"}),
                 "description": ("STRING", {"multiline": True}),
                 "tags": ("STRING", {"default": ""}),
+                # v1 Vaults only accept base64 JSON; newer ones take raw multipart
+                "vault_api_v1": ("BOOLEAN", {"default": True}),
             }
         }
     
@@ -41,44 +42,51 @@ class VaultSaveNode:
     
     def save_to_vault(self, image, token_type, token_name, 
                       vault_url="http://localhost:8080",
-                      description="", tags=""):
+                      description="", tags="", vault_api_v1=True):
         """
         Save the generated image to the Vault.
         Returns the saved asset ID and passes through the image.
         """
         
         # Convert tensor to PIL image
-        img_np = (image[0].cpu().numpy() * 255).astype(np.uint8)
-        pil_image = Image.fromarray(img_np)
+        pil_image = tensor_to_pil(image)
         
         # Generate unique filename
         asset_id = str(uuid.uuid4())[:8]
         filename = f"{token_type}_{token_name}_{asset_id}.png" if token_name else f"output_{asset_id}.png"
         
-        # Convert to base64 for upload
-        buffer = BytesIO()
-        pil_image.save(buffer, format="PNG")
-        img_b64 = base64.b64encode(buffer.getvalue()).decode()
+        fields = {
+            "token_type": token_type,
+            "token_name": token_name,
+            "description": description,
+            "tags": [tag for t in tags.split(",") if (tag := t.strip())],
+        }
         
         try:
             # Upload to Vault
-            payload = {
-                "filename": filename,
-                "data": img_b64,
-                "token_type": token_type,
-                "token_name": token_name,
-                "description": description,
-                "tags": [t.strip() for t in tags.split(",") if t.strip()],
-            }
-            
-            response = requests.post(
-                f"{vault_url}/api/assets/upload",
-                json=payload,
-                timeout=30
-            )
+            if vault_api_v1:
+                payload = {
+                    "filename": filename,
+                    "data": encode_png_base64(pil_image),
+                    **fields,
+                }
+                response = post_json(
+                    f"{vault_url}/api/assets/upload",
+                    payload,
+                    timeout=30
+                )
+            else:
+                # Raw PNG part: no base64 inflation on the wire or decode on the server
+                files = {"file": (filename, encode_png(pil_image), "image/png")}
+                response = session.post(
+                    f"{vault_url}/api/assets/upload",
+                    files=files,
+                    data=fields,
+                    timeout=30
+                )
             
             if response.status_code == 200:
-                result = response.json()
+                result = parse_json(response)
                 saved_id = result.get("id", asset_id)
             else:
                 saved_id = f"local:{asset_id}"
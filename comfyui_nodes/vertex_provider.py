@@ -6,18 +6,18 @@ Supports: Imagen 3, Veo, and other Google models.
 """
 
 import os
-import base64
-from io import BytesIO
-from PIL import Image
-import numpy as np
-import torch
+import math
+from bisect import bisect_right
+from types import MappingProxyType
 
-try:
-    from google.cloud import aiplatform
-    from google.cloud.aiplatform.gapic import PredictionServiceClient
-    HAS_GOOGLE_CLOUD = True
-except ImportError:
-    HAS_GOOGLE_CLOUD = False
+from ._image import tensor_to_pil, pil_to_tensor
+
+
+# Imagen aspect ratios by width/height, split at the original thresholds:
+# < 0.6, < 0.8, <= 1.2, <= 1.6, else. Nudging the upper bounds up one ulp
+# keeps those inclusive edges with a single bisect_right.
+_ASPECT_BOUNDS = (0.6, 0.8, math.nextafter(1.2, math.inf), math.nextafter(1.6, math.inf))
+_ASPECT_LABELS = ("9:16", "3:4", "1:1", "4:3", "16:9")
 
 
 class VertexProviderNode:
@@ -46,6 +46,12 @@ class VertexProviderNode:
     RETURN_NAMES = ("image", "credits_used")
     FUNCTION = "generate"
     
+    _COSTS = MappingProxyType({
+        "imagen-4": 0.04,
+        "imagen-4-fast": 0.02,
+        "veo-3.1": 0.50,  # per second
+    })
+    
     def __init__(self):
         self.project_id = os.environ.get("GOOGLE_CLOUD_PROJECT", "")
         self.location = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
@@ -53,7 +59,10 @@ class VertexProviderNode:
     def generate(self, prompt, model, width, height,
                  negative_prompt="", seed=-1, num_images=1, input_image=None):
         
-        if not HAS_GOOGLE_CLOUD:
+        # Imported here so workflows that never use Vertex don't pay for it
+        try:
+            from google.cloud import aiplatform
+        except ImportError:
             raise ImportError("google-cloud-aiplatform package not installed")
         
         if not self.project_id:
@@ -91,8 +100,7 @@ class VertexProviderNode:
         # Generate
         if input_image is not None:
             # Convert tensor to PIL for edit mode
-            img_np = (input_image[0].cpu().numpy() * 255).astype(np.uint8)
-            base_image = Image.fromarray(img_np)
+            base_image = tensor_to_pil(input_image)
             response = imagen.edit_image(
                 prompt=prompt,
                 base_image=base_image,
@@ -107,8 +115,7 @@ class VertexProviderNode:
         # Get first image
         if response.images:
             img = response.images[0]._pil_image
-            img_np = np.array(img).astype(np.float32) / 255.0
-            img_tensor = torch.from_numpy(img_np).unsqueeze(0)
+            img_tensor = pil_to_tensor(img)
             
             credits = self._estimate_credits(model, width, height)
             return (img_tensor, f"{credits:.4f}")
@@ -122,23 +129,8 @@ class VertexProviderNode:
     
     def _get_aspect_ratio(self, width, height):
         """Convert dimensions to Imagen aspect ratio string"""
-        ratio = width / height
-        if ratio > 1.6:
-            return "16:9"
-        elif ratio < 0.6:
-            return "9:16"
-        elif ratio > 1.2:
-            return "4:3"
-        elif ratio < 0.8:
-            return "3:4"
-        else:
-            return "1:1"
+        return _ASPECT_LABELS[bisect_right(_ASPECT_BOUNDS, width / height)]
     
     def _estimate_credits(self, model, width, height):
         """Estimate credits based on model"""
-        costs = {
-            "imagen-4": 0.04,
-            "imagen-4-fast": 0.02,
-            "veo-3.1": 0.50,  # per second
-        }
-        return costs.get(model, 0.02)
+        return self._COSTS.get(model, 0.02)
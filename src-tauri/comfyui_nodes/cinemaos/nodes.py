@@ -2,6 +2,8 @@ import nodes
 import folder_paths
 import comfy.samplers
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageOps
 import numpy as np
 import torch
@@ -10,17 +12,40 @@ import torch
 # STANDARD ADAPTERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Checkpoint names cached between INPUT_TYPES calls so schema rebuilds
+# don't rescan the checkpoints folder every time
+_CHECKPOINT_LIST_TTL = 60.0
+_checkpoint_cache = {"time": None, "names": ()}
+
+def _checkpoint_names():
+    now = time.monotonic()
+    if _checkpoint_cache["time"] is None or now - _checkpoint_cache["time"] > _CHECKPOINT_LIST_TTL:
+        _checkpoint_cache["names"] = tuple(folder_paths.get_filename_list("checkpoints"))
+        _checkpoint_cache["time"] = now
+    # ComfyUI only treats list-typed inputs as combos, so hand back a list
+    return list(_checkpoint_cache["names"])
+
+# ComfyUI's wrapped nodes keep no per-call state, so each adapter reuses one
+# instance, created on first use rather than at import
+_comfy_nodes = {}
+
+def _comfy_node(node_class):
+    node = _comfy_nodes.get(node_class)
+    if node is None:
+        node = _comfy_nodes[node_class] = node_class()
+    return node
+
 class CinemaOS_CheckpointLoader:
     """Adapter for CheckpointLoaderSimple"""
     @classmethod
     def INPUT_TYPES(s):
-        return {"required": {"ckpt_name": (folder_paths.get_filename_list("checkpoints"), )}}
+        return {"required": {"ckpt_name": (_checkpoint_names(), )}}
     RETURN_TYPES = ("MODEL", "CLIP", "VAE")
     FUNCTION = "load_checkpoint"
     CATEGORY = "CinemaOS/Standard"
 
     def load_checkpoint(self, ckpt_name):
-        return nodes.CheckpointLoaderSimple().load_checkpoint(ckpt_name)
+        return _comfy_node(nodes.CheckpointLoaderSimple).load_checkpoint(ckpt_name)
 
 class CinemaOS_EmptyLatent:
     """Adapter for EmptyLatentImage"""
@@ -36,7 +61,7 @@ class CinemaOS_EmptyLatent:
     CATEGORY = "CinemaOS/Standard"
 
     def generate(self, width, height, batch_size=1):
-        return nodes.EmptyLatentImage().generate(width, height, batch_size)
+        return _comfy_node(nodes.EmptyLatentImage).generate(width, height, batch_size)
 
 class CinemaOS_CLIPTextEncode:
     """Adapter for CLIPTextEncode"""
@@ -51,7 +76,7 @@ class CinemaOS_CLIPTextEncode:
     CATEGORY = "CinemaOS/Standard"
 
     def encode(self, text, clip):
-        return nodes.CLIPTextEncode().encode(clip, text)
+        return _comfy_node(nodes.CLIPTextEncode).encode(clip, text)
 
 class CinemaOS_KSampler:
     """Adapter for KSampler"""
@@ -74,7 +99,7 @@ class CinemaOS_KSampler:
     CATEGORY = "CinemaOS/Standard"
 
     def sample(self, model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise):
-        return nodes.KSampler().sample(model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise)
+        return _comfy_node(nodes.KSampler).sample(model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise)
 
 class CinemaOS_VAEDecode:
     """Adapter for VAEDecode"""
@@ -86,7 +111,16 @@ class CinemaOS_VAEDecode:
     CATEGORY = "CinemaOS/Standard"
 
     def decode(self, samples, vae):
-        return nodes.VAEDecode().decode(samples, vae)
+        return _comfy_node(nodes.VAEDecode).decode(samples, vae)
+
+# PNG compression runs in C with the GIL released, so the frames of a batch encode in parallel
+_SAVE_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="CinemaOS-save")
+_PNG_COMPRESS_LEVEL = 4 # SaveImage's default
+
+def _write_png(image, path):
+    # Converted per frame, as SaveImage does, so no batch-sized uint8/float copy is made
+    pixels = image.mul(255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+    Image.fromarray(pixels).save(path, compress_level=_PNG_COMPRESS_LEVEL)
 
 class CinemaOS_SaveImage:
     """Adapter for SaveImage"""
@@ -102,12 +136,28 @@ class CinemaOS_SaveImage:
     CATEGORY = "CinemaOS/Standard"
 
     def save_images(self, images, filename_prefix="CinemaOS"):
-        return nodes.SaveImage().save_images(images, filename_prefix)
+        # Same conversion, naming and UI result as SaveImage; only the PNG encodes run concurrently
+        output_dir = folder_paths.get_output_directory()
+        full_output_folder, filename, counter, subfolder, filename_prefix = folder_paths.get_save_image_path(
+            filename_prefix, output_dir, images[0].shape[1], images[0].shape[0])
+        results, jobs = [], []
+        for batch_number, frame in enumerate(images):
+            file = f"{filename.replace('%batch_num%', str(batch_number))}_{counter + batch_number:05}_.png"
+            jobs.append(_SAVE_POOL.submit(_write_png, frame, os.path.join(full_output_folder, file)))
+            results.append({"filename": file, "subfolder": subfolder, "type": "output"})
+        # Wait before returning: the UI result points at these files
+        for job in jobs:
+            job.result()
+        return {"ui": {"images": results}}
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # VAULT & NATIVE INTEGRATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Shared placeholders returned when an asset can't be loaded; never modified in place
+_EMPTY_IMAGE = torch.zeros((1, 512, 512, 3), dtype=torch.float32, device="cpu")
+_EMPTY_MASK = torch.zeros((1, 512, 512), dtype=torch.float32, device="cpu")
+
 class CinemaOS_VaultLoader:
     """Loads assets directly from filesystem absolute paths"""
     @classmethod
@@ -123,25 +173,30 @@ class CinemaOS_VaultLoader:
     CATEGORY = "CinemaOS/Vault"
 
     def load_asset(self, asset_path, asset_type):
-        if not os.path.exists(asset_path):
-            print(f"[CinemaOS] Asset not found: {asset_path}")
-            empty = torch.zeros((1, 512, 512, 3), dtype=torch.float32, device="cpu")
-            return (empty, torch.zeros((1, 512, 512), dtype=torch.float32, device="cpu"))
-        
         if asset_type == "image":
-            img = Image.open(asset_path)
+            # Open directly rather than stat first; covers missing, unreadable and non-image files
+            try:
+                img = Image.open(asset_path)
+            except OSError as e:
+                print(f"[CinemaOS] Asset not loaded: {asset_path} ({e})")
+                return (_EMPTY_IMAGE, _EMPTY_MASK)
             img = ImageOps.exif_transpose(img)
             if img.mode == 'I':
                 img = img.point(lambda i: i * (1 / 255))
-            image = img.convert("RGB")
-            image = np.array(image).astype(np.float32) / 255.0
-            image = torch.from_numpy(image)[None,]
+            image = img if img.mode == "RGB" else img.convert("RGB")
+            image = np.multiply(np.asarray(image), np.float32(1 / 255.0), dtype=np.float32)
+            image = torch.from_numpy(image).unsqueeze_(0)
             if 'A' in img.getbands():
-                mask = np.array(img.getchannel('A')).astype(np.float32) / 255.0
-                mask = 1.0 - torch.from_numpy(mask)
+                mask = np.multiply(np.asarray(img.getchannel('A')), np.float32(-1 / 255.0), dtype=np.float32)
+                mask = torch.from_numpy(mask).add_(1.0).unsqueeze_(0)
             else:
-                mask = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
+                # ComfyUI's own "no mask": a small zero mask that consumers resize as needed
+                mask = torch.zeros((1, 64, 64), dtype=torch.float32, device="cpu")
             return (image, mask)
+        
+        if not os.path.exists(asset_path):
+            print(f"[CinemaOS] Asset not found: {asset_path}")
+            return (_EMPTY_IMAGE, _EMPTY_MASK)
         return (None, None)
 
 class CinemaOS_LlamaGen:
@@ -1,16 +1,163 @@
 import os
-import requests
+import collections
+import functools
+import hashlib
+import json
 import torch
-import numpy as np
 from PIL import Image
 import io
 
+from .cinemaos_http import SESSION
+from .cinemaos_registry import register
+from .cinemaos_utils import pil_to_bhwc, chw_uint8_to_bhwc
+
 # Try to import fal_client
 try:
     import fal_client
 except ImportError:
     fal_client = None
 
+# torchvision decodes in C++ without holding the GIL; PIL is the fallback
+try:
+    from torchvision.io import decode_image, ImageReadMode
+except ImportError:
+    decode_image = None
+
+# PyAV decodes a preview frame from a partial MP4 download
+try:
+    import av
+except ImportError:
+    av = None
+
+# Enough of the file for the header and the first keyframe of a faststart MP4
+_VIDEO_PREVIEW_BYTES = 1 << 20
+
+def _download(url, limit=None):
+    """Stream a URL into a bytearray, stopping once `limit` bytes have arrived"""
+    headers = {"Range": f"bytes=0-{limit - 1}"} if limit else None
+    buf = bytearray()
+    with SESSION.get(url, headers=headers, stream=True, timeout=(5, 60)) as response:
+        response.raise_for_status()
+        # Servers that ignore Range send the whole file, so cut the stream off ourselves
+        for chunk in response.iter_content(chunk_size=1 << 16):
+            buf += chunk
+            if limit and len(buf) >= limit:
+                break
+    return buf
+
+def _decode_first_frame(data):
+    """Decode the first video frame of (possibly truncated) MP4 bytes"""
+    with av.open(io.BytesIO(data)) as container:
+        frame = next(container.decode(video=0))
+    return pil_to_bhwc(frame.to_image())
+
+# Failure placeholders are shared between calls instead of reallocated each time,
+# so callers must never modify them in place
+@functools.lru_cache(maxsize=8)
+def _blank(height, width):
+    """Black (1, H, W, 3) placeholder image returned when generation fails"""
+    return torch.zeros((1, height, width, 3), dtype=torch.float32)
+
+def _decode_image(data):
+    """Decode downloaded image bytes into a (1, H, W, 3) float tensor in [0, 1]"""
+    if decode_image is not None:
+        try:
+            buf = data if isinstance(data, bytearray) else bytearray(data)
+            chw = decode_image(torch.frombuffer(buf, dtype=torch.uint8), mode=ImageReadMode.RGB)
+            # 16-bit PNGs decode to uint16; leave those to the PIL path below
+            if chw.dtype == torch.uint8:
+                return chw_uint8_to_bhwc(chw)
+        except RuntimeError:
+            pass
+    return pil_to_bhwc(Image.open(io.BytesIO(data)).convert("RGB"))
+
+# Seeded generations are deterministic, so results are cached on a hash of
+# (endpoint, arguments): an in-memory LRU in front of .pt files on disk.
+_RESULT_CACHE_SIZE = 16
+_RESULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), "CinemaOS", "cache", "fal")
+# Entries are raw float32 tensors (~12 MB at 1024², ~200 MB at 4K), so the
+# directory is kept under a byte budget, evicting least recently used files first
+_RESULT_CACHE_MAX_BYTES = 2 << 30
+_result_cache = collections.OrderedDict()
+
+def _result_key(endpoint, arguments):
+    blob = json.dumps([endpoint, arguments], sort_keys=True).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+def _remember_result(key, result):
+    _result_cache[key] = result
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+def _load_result(key):
+    """Return a cached (image, url) pair, or None on a miss"""
+    result = _result_cache.get(key)
+    if result is not None:
+        _result_cache.move_to_end(key)
+        return result
+    path = os.path.join(_RESULT_CACHE_DIR, f"{key}.pt")
+    try:
+        saved = torch.load(path, map_location="cpu", weights_only=True)
+        # Bump the mtime so pruning treats this entry as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[CinemaOS] Ignoring unreadable Fal cache entry {key}: {e}")
+        return None
+    result = (saved["image"], saved["url"])
+    _remember_result(key, result)
+    return result
+
+def _prune_results():
+    """Delete the least recently used cache files beyond the byte budget"""
+    entries = []
+    try:
+        with os.scandir(_RESULT_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".pt"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _RESULT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+def _save_result(key, img_tensor, image_url):
+    _remember_result(key, (img_tensor, image_url))
+    path = os.path.join(_RESULT_CACHE_DIR, f"{key}.pt")
+    try:
+        os.makedirs(_RESULT_CACHE_DIR, exist_ok=True)
+        torch.save({"image": img_tensor, "url": image_url}, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"[CinemaOS] Could not write Fal cache entry {key}: {e}")
+        return
+    _prune_results()
+
+# Model ID -> Fal endpoint. Canonical IDs hit the dict directly; anything else is
+# matched by substring in this order, as the old if/elif chain did.
+_DEFAULT_ENDPOINT = "fal-ai/flux-pro/v1.1-ultra" # Default to best
+_ENDPOINTS = {
+    "flux-schnell": "fal-ai/flux/schnell",
+    "kling": "fal-ai/kling-video/v1/standard/text-to-video",
+}
+
+def _endpoint_for(model):
+    endpoint = _ENDPOINTS.get(model)
+    if endpoint is None:
+        endpoint = next((ep for key, ep in _ENDPOINTS.items() if key in model), _DEFAULT_ENDPOINT)
+    return endpoint
+
+@register("FalProvider", "Fal.ai Provider")
 class FalProvider:
     """
     CinemaOS Adapter for Fal.ai Cloud Generation.
@@ -44,17 +191,10 @@ class FalProvider:
         if not fal_client:
             print("[CinemaOS] fal_client not found. Cloud generation skipped.")
             # Return blank image
-            blank = torch.zeros((1, height, width, 3), dtype=torch.float32)
-            return (blank, "")
+            return (_blank(height, width), "")
 
-        print(f"[CinemaOS] Generating on Fal with {model}...")
-        
         # Map model IDs to Fal Endpoints
-        endpoint = "fal-ai/flux-pro/v1.1-ultra" # Default to best
-        if "flux-schnell" in model:
-            endpoint = "fal-ai/flux/schnell"
-        elif "kling" in model:
-            endpoint = "fal-ai/kling-video/v1/standard/text-to-video"
+        endpoint = _endpoint_for(model)
 
         arguments = {
             "prompt": prompt,
@@ -68,39 +208,74 @@ class FalProvider:
             "enable_safety_checker": False
         }
 
+        # A random seed (-1) means the caller wants a fresh image every time
+        cache_key = _result_key(endpoint, arguments) if arguments["seed"] is not None else None
+        if cache_key:
+            cached = _load_result(cache_key)
+            if cached is not None:
+                print(f"[CinemaOS] Reusing cached Fal result for {model}")
+                return cached
+
+        print(f"[CinemaOS] Generating on Fal with {model}...")
+
         # Handling Result
         try:
             handler = fal_client.submit(endpoint, arguments)
             result = handler.get()
         except Exception as e:
             print(f"[CinemaOS] Fal Error: {e}")
-            blank = torch.zeros((1, height, width, 3), dtype=torch.float32)
-            return (blank, "")
+            return (_blank(height, width), "")
 
         # Extract Image URL (Flux returns 'images': [{'url': ...}])
         image_url = ""
+        video_url = ""
         if 'images' in result and len(result['images']) > 0:
             image_url = result['images'][0]['url']
         elif 'video' in result:
-             # Handle video logic (download first frame for preview)
-             image_url = result['video']['url'] # Simplification
+            video_url = result['video']['url']
+
+        if video_url:
+            return self._video_preview(video_url, cache_key, width, height)
         
         if not image_url:
-             blank = torch.zeros((1, height, width, 3), dtype=torch.float32)
-             return (blank, "")
+             return (_blank(height, width), "")
 
         # Download and convert to Tensor
         try:
-            response = requests.get(image_url)
-            img = Image.open(io.BytesIO(response.content)).convert("RGB")
-            img = np.array(img).astype(np.float32) / 255.0
-            img_tensor = torch.from_numpy(img)[None,]
+            img_tensor = _decode_image(_download(image_url))
+            if cache_key:
+                _save_result(cache_key, img_tensor, image_url)
             return (img_tensor, image_url)
         except Exception as e:
             print(f"[CinemaOS] Failed to download result: {e}")
-            blank = torch.zeros((1, height, width, 3), dtype=torch.float32)
-            return (blank, "")
+            return (_blank(height, width), "")
 
+    def _video_preview(self, video_url, cache_key, width, height):
+        """Return the first frame of a video result as the preview image, plus the video URL"""
+        blank = _blank(height, width)
+        if av is None:
+            print("[CinemaOS] PyAV not found. Video preview skipped.")
+            return (blank, video_url)
+
+        # A faststart MP4 needs only its first bytes for frame 0; files with the
+        # index (moov) at the end can't be decoded from a prefix, so retry in full
+        try:
+            data = _download(video_url, limit=_VIDEO_PREVIEW_BYTES)
+            try:
+                frame = _decode_first_frame(data)
+            except Exception:
+                if len(data) < _VIDEO_PREVIEW_BYTES:
+                    raise
+                frame = _decode_first_frame(_download(video_url))
+        except Exception as e:
+            print(f"[CinemaOS] Failed to decode video preview: {e}")
+            return (blank, video_url)
+
+        if cache_key:
+            _save_result(cache_key, frame, video_url)
+        return (frame, video_url)
+
+@register("CreditTracker", "Credit Tracker")
 class CreditTracker:
     """
     Tracks credits used for cloud generation.
@@ -124,6 +299,7 @@ class CreditTracker:
         print(f"[CinemaOS] Credits charged for {model_name}: {credits_used}")
         return ()
 
+@register("VaultSave", "Save to Vault")
 class VaultSave:
     """
     Saves cloud-generated assets to the Vault.
@@ -147,15 +323,3 @@ class VaultSave:
         # Placeholder for Vault logic
         print(f"[CinemaOS] Saving to Vault: {token_type}/{token_name}")
         return ()
-
-NODE_CLASS_MAPPINGS = {
-    "FalProvider": FalProvider,
-    "CreditTracker": CreditTracker,
-    "VaultSave": VaultSave
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "FalProvider": "Fal.ai Provider",
-    "CreditTracker": "Credit Tracker",
-    "VaultSave": "Save to Vault"
-}
@@ -0,0 +1,11 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled session shared by every cloud node, so repeated requests to the same
+# hosts reuse their connections and TLS sessions instead of reconnecting
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=0.2))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
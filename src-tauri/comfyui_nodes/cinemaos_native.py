@@ -1,5 +1,8 @@
 import torch
 
+from .cinemaos_registry import register
+
+@register("CinemaOS_LlamaGen", "CinemaOS Llama Gen")
 class CinemaOS_LlamaGen:
     """
     CinemaOS Llama Generator
@@ -28,6 +31,7 @@ class CinemaOS_LlamaGen:
         enhanced_prompt = f"{prompt}, cinematic lighting, photorealistic, 8k, highly detailed"
         return (enhanced_prompt,)
 
+@register("CinemaOS_Whisper", "CinemaOS Whisper")
 class CinemaOS_Whisper:
     """
     CinemaOS Whisper
@@ -50,13 +54,3 @@ class CinemaOS_Whisper:
         # Placeholder for Whisper inference
         print(f"[CinemaOS] Transcribing {audio_path} with {model}")
         return ("(Transcribed Audio Placeholder)",)
-
-NODE_CLASS_MAPPINGS = {
-    "CinemaOS_LlamaGen": CinemaOS_LlamaGen,
-    "CinemaOS_Whisper": CinemaOS_Whisper
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "CinemaOS_LlamaGen": "CinemaOS Llama Gen",
-    "CinemaOS_Whisper": "CinemaOS Whisper"
-}
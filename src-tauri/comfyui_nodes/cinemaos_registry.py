@@ -0,0 +1,19 @@
+import functools
+
+# Filled by @register as each node module is imported; __init__.py exports these
+# directly rather than merging a mapping dict from every module
+REGISTRY = {}
+DISPLAY = {}
+
+def register(name, display, cache_inputs=True):
+    """Class decorator adding a node under `name` with its UI display name"""
+    def decorator(cls):
+        # ComfyUI rebuilds every schema on each /object_info request, so static
+        # INPUT_TYPES are computed once; nodes whose inputs change at runtime
+        # (e.g. file lists) opt out with cache_inputs=False
+        if cache_inputs:
+            cls.INPUT_TYPES = classmethod(functools.lru_cache(maxsize=None)(cls.INPUT_TYPES.__func__))
+        REGISTRY[name] = cls
+        DISPLAY[name] = display
+        return cls
+    return decorator
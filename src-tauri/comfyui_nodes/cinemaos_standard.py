@@ -1,7 +1,38 @@
 import nodes
 import folder_paths
 import comfy.samplers
-
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import torch
+
+from .cinemaos_registry import register
+
+# Checkpoint names cached between INPUT_TYPES calls so schema rebuilds
+# don't rescan the checkpoints folder every time
+_CHECKPOINT_LIST_TTL = 60.0
+_checkpoint_cache = {"time": None, "names": ()}
+
+def _checkpoint_names():
+    now = time.monotonic()
+    if _checkpoint_cache["time"] is None or now - _checkpoint_cache["time"] > _CHECKPOINT_LIST_TTL:
+        _checkpoint_cache["names"] = tuple(folder_paths.get_filename_list("checkpoints"))
+        _checkpoint_cache["time"] = now
+    # ComfyUI only treats list-typed inputs as combos, so hand back a list
+    return list(_checkpoint_cache["names"])
+
+# ComfyUI's wrapped nodes keep no per-call state, so each adapter reuses one
+# instance, created on first use rather than at import
+_comfy_nodes = {}
+
+def _comfy_node(node_class):
+    node = _comfy_nodes.get(node_class)
+    if node is None:
+        node = _comfy_nodes[node_class] = node_class()
+    return node
+
+@register("CinemaOS_CheckpointLoader", "OS Checkpoint Loader", cache_inputs=False)
 class CinemaOS_CheckpointLoader:
     """
     CinemaOS Adapter for CheckpointLoaderSimple.
@@ -9,15 +40,16 @@ class CinemaOS_CheckpointLoader:
     """
     @classmethod
     def INPUT_TYPES(s):
-        return {"required": {"ckpt_name": (folder_paths.get_filename_list("checkpoints"), )}}
+        return {"required": {"ckpt_name": (_checkpoint_names(), )}}
     
     RETURN_TYPES = ("MODEL", "CLIP", "VAE")
     FUNCTION = "load_checkpoint"
     CATEGORY = "CinemaOS/Standard"
 
     def load_checkpoint(self, ckpt_name):
-        return nodes.CheckpointLoaderSimple().load_checkpoint(ckpt_name)
+        return _comfy_node(nodes.CheckpointLoaderSimple).load_checkpoint(ckpt_name)
 
+@register("CinemaOS_EmptyLatent", "OS Empty Latent")
 class CinemaOS_EmptyLatent:
     """
     CinemaOS Adapter for EmptyLatentImage.
@@ -36,8 +68,9 @@ class CinemaOS_EmptyLatent:
     CATEGORY = "CinemaOS/Standard"
 
     def generate(self, width, height, batch_size=1):
-        return nodes.EmptyLatentImage().generate(width, height, batch_size)
+        return _comfy_node(nodes.EmptyLatentImage).generate(width, height, batch_size)
 
+@register("CinemaOS_CLIPTextEncode", "OS CLIP Text Encode")
 class CinemaOS_CLIPTextEncode:
     """
     CinemaOS Adapter for CLIPTextEncode.
@@ -54,8 +87,9 @@ class CinemaOS_CLIPTextEncode:
     CATEGORY = "CinemaOS/Standard"
 
     def encode(self, text, clip):
-        return nodes.CLIPTextEncode().encode(clip, text)
+        return _comfy_node(nodes.CLIPTextEncode).encode(clip, text)
 
+@register("CinemaOS_KSampler", "OS KSampler")
 class CinemaOS_KSampler:
     """
     CinemaOS Adapter for KSampler.
@@ -86,8 +120,9 @@ class CinemaOS_KSampler:
     def sample(self, model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise, **kwargs):
         # We safely ignore extra parameters like motion_bucket_id for now
         # until we implement specialized video sampling internal logic
-        return nodes.KSampler().sample(model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise)
+        return _comfy_node(nodes.KSampler).sample(model, seed, steps, cfg, sampler_name, scheduler, positive, negative, latent_image, denoise)
 
+@register("CinemaOS_VAEDecode", "OS VAE Decode")
 class CinemaOS_VAEDecode:
     """
     CinemaOS Adapter for VAEDecode.
@@ -101,8 +136,18 @@ class CinemaOS_VAEDecode:
     CATEGORY = "CinemaOS/Standard"
 
     def decode(self, samples, vae):
-        return nodes.VAEDecode().decode(samples, vae)
+        return _comfy_node(nodes.VAEDecode).decode(samples, vae)
+
+# PNG compression runs in C with the GIL released, so the frames of a batch encode in parallel
+_SAVE_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="CinemaOS-save")
+_PNG_COMPRESS_LEVEL = 4 # SaveImage's default
 
+def _write_png(image, path):
+    # Converted per frame, as SaveImage does, so no batch-sized uint8/float copy is made
+    pixels = image.mul(255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+    Image.fromarray(pixels).save(path, compress_level=_PNG_COMPRESS_LEVEL)
+
+@register("CinemaOS_SaveImage", "OS Save Image")
 class CinemaOS_SaveImage:
     """
     CinemaOS Adapter for SaveImage.
@@ -121,30 +166,21 @@ class CinemaOS_SaveImage:
     CATEGORY = "CinemaOS/Standard"
 
     def save_images(self, images, filename_prefix="CinemaOS"):
-        return nodes.SaveImage().save_images(images, filename_prefix)
-
-# Mappings are now handled in __init__.py for better package structure
-# But we keep them here as local exports
-NODE_CLASS_MAPPINGS = {
-    "CinemaOS_CheckpointLoader": CinemaOS_CheckpointLoader,
-    "CinemaOS_EmptyLatent": CinemaOS_EmptyLatent,
-    "CinemaOS_CLIPTextEncode": CinemaOS_CLIPTextEncode,
-    "CinemaOS_KSampler": CinemaOS_KSampler,
-    "CinemaOS_VAEDecode": CinemaOS_VAEDecode,
-    "CinemaOS_SaveImage": CinemaOS_SaveImage,
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "CinemaOS_CheckpointLoader": "OS Checkpoint Loader",
-    "CinemaOS_EmptyLatent": "OS Empty Latent",
-    "CinemaOS_CLIPTextEncode": "OS CLIP Text Encode",
-    "CinemaOS_KSampler": "OS KSampler",
-    "CinemaOS_VAEDecode": "OS VAE Decode",
-    "CinemaOS_SaveImage": "OS Save Image",
-    "CinemaOS_LoadImage": "OS Load Image",
-    "CinemaOS_VAEEncode": "OS VAE Encode",
-}
-
+        # Same conversion, naming and UI result as SaveImage; only the PNG encodes run concurrently
+        output_dir = folder_paths.get_output_directory()
+        full_output_folder, filename, counter, subfolder, filename_prefix = folder_paths.get_save_image_path(
+            filename_prefix, output_dir, images[0].shape[1], images[0].shape[0])
+        results, jobs = [], []
+        for batch_number, frame in enumerate(images):
+            file = f"{filename.replace('%batch_num%', str(batch_number))}_{counter + batch_number:05}_.png"
+            jobs.append(_SAVE_POOL.submit(_write_png, frame, os.path.join(full_output_folder, file)))
+            results.append({"filename": file, "subfolder": subfolder, "type": "output"})
+        # Wait before returning: the UI result points at these files
+        for job in jobs:
+            job.result()
+        return {"ui": {"images": results}}
+
+@register("CinemaOS_VAEEncode", "OS VAE Encode")
 class CinemaOS_VAEEncode:
     """
     CinemaOS Adapter for VAEEncode.
@@ -160,8 +196,4 @@ class CinemaOS_VAEEncode:
     CATEGORY = "CinemaOS/Standard"
 
     def encode(self, pixels, vae):
-        return nodes.VAEEncode().encode(pixels, vae)
-
-NODE_CLASS_MAPPINGS["CinemaOS_VAEEncode"] = CinemaOS_VAEEncode
-
-
+        return _comfy_node(nodes.VAEEncode).encode(pixels, vae)
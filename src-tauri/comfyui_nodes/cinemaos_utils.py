@@ -0,0 +1,21 @@
+"""
+Conversions from decoded uint8 images to ComfyUI IMAGE tensors.
+
+Both helpers produce a contiguous (1, H, W, C) float32 batch in [0, 1] with a
+single cast-and-scale pass over the pixels. PIL's array view is read-only, so
+np.multiply writes the float32 buffer that torch then wraps without copying;
+torchvision's CHW output is reordered to HWC while still uint8, where the copy
+is a quarter of the float size.
+"""
+
+import numpy as np
+import torch
+
+def pil_to_bhwc(img):
+    """Convert a uint8 PIL image to a (1, H, W, C) float32 tensor in [0, 1]"""
+    arr = np.multiply(np.asarray(img), np.float32(1 / 255.0), dtype=np.float32)
+    return torch.from_numpy(arr).unsqueeze_(0)
+
+def chw_uint8_to_bhwc(chw):
+    """Convert a (C, H, W) uint8 tensor from torchvision.io to a (1, H, W, C) float32 tensor in [0, 1]"""
+    return chw.permute(1, 2, 0).contiguous().to(torch.float32).div_(255.0).unsqueeze_(0)
@@ -1,9 +1,52 @@
 import os
+import collections
 import folder_paths
 from PIL import Image, ImageOps
 import numpy as np
 import torch
 
+from .cinemaos_registry import register
+from .cinemaos_utils import pil_to_bhwc, chw_uint8_to_bhwc
+
+# torchvision decodes JPEG/PNG in C++ without holding the GIL; PIL covers the rest
+try:
+    from torchvision.io import read_image, ImageReadMode
+except ImportError:
+    read_image = None
+
+_EXIF_ORIENTATION = 0x0112
+
+def _orientation(img):
+    """EXIF orientation of an opened image, read without decoding its pixels"""
+    if img.format != "PNG":
+        # JPEG EXIF lives in the APP1 header segment, which Image.open has already parsed
+        return img.getexif().get(_EXIF_ORIENTATION, 1)
+    # PngImageFile.getexif() loads the whole image unless an eXIf chunk precedes
+    # IDAT, so only look at the chunk seen while parsing the header
+    exif = Image.Exif()
+    raw = img.info.get("exif")
+    if raw:
+        exif.load(raw)
+    return exif.get(_EXIF_ORIENTATION, 1)
+
+def _is_plain_rgb(img):
+    """True when decoding straight to RGB matches the PIL path: no alpha, no rotation"""
+    return (img.format in ("JPEG", "PNG")
+            and img.mode in ("RGB", "L")
+            and "transparency" not in img.info
+            and _orientation(img) == 1)
+
+# Shared placeholders returned when an asset can't be loaded; never modified in place
+_EMPTY_IMAGE = torch.zeros((1, 512, 512, 3), dtype=torch.float32, device="cpu")
+_EMPTY_MASK = torch.zeros((1, 512, 512), dtype=torch.float32, device="cpu")
+
+# Decoded (image, mask) pairs keyed on (realpath, mtime, asset_type), so re-running
+# a workflow skips the decode and an edited file is picked up by its new mtime.
+# Entries are shared with downstream nodes, which treat their inputs as read-only.
+_VAULT_CACHE = collections.OrderedDict()
+_VAULT_MAX = 32
+
+@register("CinemaOS_VaultLoader", "CinemaOS Vault Loader")
 class CinemaOS_VaultLoader:
     """
     CinemaOS Vault Loader
@@ -25,47 +68,63 @@ class CinemaOS_VaultLoader:
     CATEGORY = "CinemaOS"
 
     def load_asset(self, asset_path, asset_type):
-        if not os.path.exists(asset_path):
+        try:
+            mtime = os.stat(asset_path).st_mtime_ns
+        except OSError:
             print(f"[CinemaOS] Asset not found: {asset_path}")
             # Return empty black image on failure to prevent crash
-            empty = torch.zeros((1, 512, 512, 3), dtype=torch.float32, device="cpu")
-            return (empty, torch.zeros((1, 512, 512), dtype=torch.float32, device="cpu"))
+            return (_EMPTY_IMAGE, _EMPTY_MASK)
+
+        key = (os.path.realpath(asset_path), mtime, asset_type)
+        cached = _VAULT_CACHE.get(key)
+        if cached is not None:
+            _VAULT_CACHE.move_to_end(key)
+            return cached
 
         if asset_type == "image":
-            return self.load_image(asset_path)
-        
-        # TODO: Implement LoRA loading logic if needed here, 
-        # though usually LoRAs are handled by LoraLoader using model weights.
-        # This node might just return the path for a specialized Lora loader.
-        
-        return self.load_image(asset_path)
+            result = self.load_image(asset_path)
+        else:
+            # TODO: Implement LoRA loading logic if needed here, 
+            # though usually LoRAs are handled by LoraLoader using model weights.
+            # This node might just return the path for a specialized Lora loader.
+            result = self.load_image(asset_path)
+
+        _VAULT_CACHE[key] = result
+        while len(_VAULT_CACHE) > _VAULT_MAX:
+            _VAULT_CACHE.popitem(last=False)
+        return result
 
     def load_image(self, path):
-        img = Image.open(path)
-        img = ImageOps.exif_transpose(img)
-        
-        # Convert to RGB
-        if img.mode == 'I':
-            img = img.point(lambda i: i * (1 / 255))
-        image = img.convert("RGB")
-        
-        # Normalize to 0-1
-        image = np.array(image).astype(np.float32) / 255.0
-        image = torch.from_numpy(image)[None,]
-        
-        # Mask handling
-        if 'A' in img.getbands():
-            mask = np.array(img.getchannel('A')).astype(np.float32) / 255.0
-            mask = 1.0 - torch.from_numpy(mask)
-        else:
-            mask = torch.zeros((64, 64), dtype=torch.float32, device="cpu")
+        # Opening only parses the header; _is_plain_rgb checks it without decoding pixels.
+        # One handle serves both paths and is closed however the load ends.
+        with Image.open(path) as img:
+            if read_image is not None and _is_plain_rgb(img):
+                try:
+                    chw = read_image(path, ImageReadMode.RGB)
+                except RuntimeError:
+                    chw = None
+                # 16-bit PNGs decode to uint16 here; PIL handles those so results match its path
+                if chw is not None and chw.dtype == torch.uint8:
+                    return (chw_uint8_to_bhwc(chw), torch.zeros((1, 64, 64), dtype=torch.float32, device="cpu"))
+
+            img = ImageOps.exif_transpose(img)
+            
+            # Convert to RGB. 32-bit integer ('I') images, e.g. 16-bit PNGs, are rescaled
+            # first because convert() clamps them to 0-255 rather than scaling; PIL runs
+            # a linear lambda like this as a single C-level pass, not per pixel
+            if img.mode == 'I':
+                img = img.point(lambda i: i * (1 / 255))
+            image = img if img.mode == "RGB" else img.convert("RGB")
+            
+            # Normalize to 0-1
+            image = pil_to_bhwc(image)
+            
+            # Mask handling: 1 - alpha/255 in one pass
+            if 'A' in img.getbands():
+                mask = np.multiply(np.asarray(img.getchannel('A')), np.float32(-1 / 255.0), dtype=np.float32)
+                mask = torch.from_numpy(mask).add_(1.0).unsqueeze_(0)
+            else:
+                # ComfyUI's own "no mask": a small zero mask that consumers resize as needed
+                mask = torch.zeros((1, 64, 64), dtype=torch.float32, device="cpu")
             
         return (image, mask)
-
-NODE_CLASS_MAPPINGS = {
-    "CinemaOS_VaultLoader": CinemaOS_VaultLoader
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "CinemaOS_VaultLoader": "CinemaOS Vault Loader"
-}
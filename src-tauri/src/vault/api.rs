@@ -7,13 +7,14 @@
 
 use axum::{
     extract::{Path, State},
-    http::StatusCode,
-    response::Json,
+    http::{header, HeaderMap, StatusCode},
+    response::{IntoResponse, Json, Response},
     routing::{get, post},
     Router,
 };
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
+use std::hash::{Hash, Hasher};
 use std::sync::Arc;
 use tokio::sync::RwLock;
 
@@ -60,10 +61,20 @@ pub struct CreditUsage {
     pub credits: f32,
     pub model: String,
     pub project_id: Option<String>,
-    pub timestamp: String,
+    /// ISO 8601 timestamp sent by older nodes
+    #[serde(default)]
+    pub timestamp: Option<String>,
+    /// Unix time in nanoseconds sent by current nodes
+    #[serde(default)]
+    pub timestamp_ns: Option<u64>,
     pub node_id: Option<String>,
 }
 
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct CreditUsageBatch {
+    pub events: Vec<CreditUsage>,
+}
+
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct CreditBalance {
     pub balance: f32,
@@ -91,16 +102,34 @@ pub type SharedState = Arc<RwLock<VaultState>>;
 async fn get_token(
     Path((token_type, token_name)): Path<(String, String)>,
     State(state): State<SharedState>,
-) -> Result<Json<TokenData>, StatusCode> {
+    headers: HeaderMap,
+) -> Result<Response, StatusCode> {
     let state = state.read().await;
     let key = format!("{}:{}", token_type, token_name);
 
-    state
-        .tokens
-        .get(&key)
-        .cloned()
-        .map(Json)
-        .ok_or(StatusCode::NOT_FOUND)
+    let token = state.tokens.get(&key).ok_or(StatusCode::NOT_FOUND)?;
+    let body = serde_json::to_vec(token).map_err(|_| StatusCode::INTERNAL_SERVER_ERROR)?;
+
+    // ETag over the serialized token so nodes can revalidate with If-None-Match
+    let mut hasher = std::collections::hash_map::DefaultHasher::new();
+    body.hash(&mut hasher);
+    let etag = format!("\"{:016x}\"", hasher.finish());
+
+    let if_none_match = headers
+        .get(header::IF_NONE_MATCH)
+        .and_then(|v| v.to_str().ok());
+    if if_none_match == Some(etag.as_str()) {
+        return Ok((StatusCode::NOT_MODIFIED, [(header::ETAG, etag)]).into_response());
+    }
+
+    Ok((
+        [
+            (header::ETAG, etag),
+            (header::CONTENT_TYPE, "application/json".to_string()),
+        ],
+        body,
+    )
+        .into_response())
 }
 
 async fn list_tokens(
@@ -174,6 +203,22 @@ async fn track_credits(
     })
 }
 
+async fn track_credits_batch(
+    State(state): State<SharedState>,
+    Json(batch): Json<CreditUsageBatch>,
+) -> Json<CreditBalance> {
+    let mut state = state.write().await;
+    for usage in &batch.events {
+        state.credit_used += usage.credits;
+        state.credit_balance -= usage.credits;
+    }
+
+    Json(CreditBalance {
+        balance: state.credit_balance,
+        used_this_session: state.credit_used,
+    })
+}
+
 async fn get_credit_balance(State(state): State<SharedState>) -> Json<CreditBalance> {
     let state = state.read().await;
     Json(CreditBalance {
@@ -202,6 +247,7 @@ pub fn create_router(state: SharedState) -> Router {
         .route("/api/assets/upload", post(upload_asset))
         // Credits
         .route("/api/credits/usage", post(track_credits))
+        .route("/api/credits/usage/batch", post(track_credits_batch))
         .route("/api/credits/balance", get(get_credit_balance))
         .with_state(state)
 }